@@ -1,35 +1,247 @@
 """Functions for parsing PyFlux output files"""
 
+import codecs
+import contextlib
+import copy
 import functools
-import gzip
+import itertools
 import logging
 import multiprocessing
+import os
 import re
+import threading
 import warnings
+from collections import defaultdict
 from collections.abc import Iterable
-from io import StringIO, TextIOBase
+from io import BufferedIOBase, BufferedReader, BytesIO, TextIOBase, TextIOWrapper
 from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
 import pandas as pd
 
+try:  # ISA-L accelerated gzip decompression, a drop-in replacement for gzip
+    from isal import igzip as _gzip
+except ImportError:
+    import gzip as _gzip
+
+try:  # limits the threads of numerical libraries which are already loaded
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
 logger = logging.getLogger(__name__)
 
+_BUFFER_SIZE = 128 * 1024  # Size of file read buffers in bytes
+_CHUNK_SIZE = 4 * 1024 * 1024  # Default number of bytes to read at a time
+_MIN_CHUNK_SIZE = 512 * 1024
+_TZ_RE = re.compile(r"UTC(\+\d+)")  # time zone offset in the index name
+_DATA_ROW_RE = re.compile(rb"[\r\n]\s*\S")  # a non-empty line after the header row
+_LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+# Non-ASCII characters and regex syntax which may match differently in bytes than in
+# text, e.g. character classes, "." and inline flags
+_BYTES_UNSAFE_RE = re.compile(r"[^\x00-\x7f]|\\[A-Za-z]|[.\[]|\(\?[A-Za-z-]")
+
+# Environment variables limiting the threads of numerical libraries
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+# Pandas >= 3 always uses Copy-on-Write and deprecates the related options
+if int(pd.__version__.split(".")[0]) < 3:
+    # Avoid intermediate copies. This applies to all use of pandas in the process.
+    pd.set_option("mode.copy_on_write", True)
+    _CONCAT_KWARGS = dict(copy=False)  # avoid copying data when joining frames
+else:
+    _CONCAT_KWARGS = {}
+
+
+def _init_worker():
+    """Use one thread for numerical libraries in a worker process
+
+    The environment variables only take effect in processes which load the libraries
+    after they are set, i.e. with the "spawn" and "forkserver" start methods. Forked
+    workers have already loaded them, so they are limited with threadpoolctl, if it
+    is installed.
+    """
+    for var in _THREAD_ENV_VARS:
+        os.environ.setdefault(var, "1")
+    if threadpool_limits is not None:
+        threadpool_limits(limits=1)
+    _hook_parser_warnings()  # not inherited by spawned workers
+
+
+_warning_context = threading.local()  # `parse` call of the current thread
+_showwarning = None  # the replaced `warnings.showwarning`, once hooked
+
+
+def _show_warning(message, category, filename, lineno, file=None, line=None):
+    """Log parser warnings with the logger of the current `parse` call
+
+    Each distinct warning is logged only once per call. Other warnings are shown as
+    before.
+    """
+    context = getattr(_warning_context, "current", None)
+    if context is None or not issubclass(category, pd.errors.ParserWarning):
+        _showwarning(message, category, filename, lineno, file, line)
+        return
+    source, log, seen = context
+    text = str(message).strip()
+    if text not in seen:
+        seen.add(text)
+        log.warning("Bad line in %s: %s", source, text)
+
+
+def _hook_parser_warnings():
+    """Show warnings with `_show_warning`, done once per process
+
+    Catching warnings for every frame would be slower and is not thread safe. The
+    "always" filter is needed since pandas changes the warning filters internally,
+    which resets the registry of shown warnings. It is appended so that filters set
+    by the user take precedence.
+    """
+    global _showwarning
+    if _showwarning is None:
+        warnings.filterwarnings("always", category=pd.errors.ParserWarning, append=True)
+        _showwarning = warnings.showwarning
+        warnings.showwarning = _show_warning
+
+
+@contextlib.contextmanager
+def _log_parser_warnings(source: str, log: logging.Logger):
+    """Log parser warnings of the current thread for `source`, see `_show_warning`"""
+    previous = getattr(_warning_context, "current", None)
+    _warning_context.current = (source, log, set())
+    try:
+        yield
+    finally:
+        _warning_context.current = previous
+
+
+def _concat(frames: Iterable[pd.DataFrame | None]) -> pd.DataFrame:
+    """Join frames, skipping None values. A single frame is returned as is.
+
+    Raises ValueError if there is nothing to join.
+    """
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, axis=0, join="outer", **_CONCAT_KWARGS)
+
+
+def _find_headers(
+    regex: re.Pattern, data: bytes, end: int, encoding: str = "utf-8"
+):
+    """Yield the start indices of header rows matching `regex` in `data[:end]`
+
+    Same as searching for ``['"]?(regex).*$`` but without the optional quotation
+    mark at the start of the pattern, which would prevent the regex engine from
+    using a fast search for a literal header.
+
+    A str `regex` is searched in the data decoded from `encoding`, for patterns which
+    would match differently in bytes.
+    """
+    if isinstance(regex.pattern, bytes):
+        yield from _search_headers(regex, data, end)
+        return
+    text = data[:end].decode(encoding, errors="surrogateescape")
+    char_pos = byte_pos = 0
+    for start in _search_headers(regex, text, len(text)):
+        # Index in the text to index in the data
+        byte_pos += len(text[char_pos:start].encode(encoding, "surrogateescape"))
+        char_pos = start
+        yield byte_pos
+
+
+def _search_headers(regex: re.Pattern, data: bytes | str, end: int):
+    """Yield the start indices of header rows in bytes or text, see `_find_headers`"""
+    quotes, newline = (b"'\"", b"\n") if isinstance(data, bytes) else ("'\"", "\n")
+    pos = 0
+    while match := regex.search(data, pos, end):
+        start = match.start()
+        # Allow a quotation mark (" or ') at the start of the header
+        if start > pos and data[start - 1] in quotes:
+            start -= 1
+        yield start
+        # Skip the rest of the header row
+        line_end = data.find(newline, match.end(), end)
+        pos = max(match.start() + 1, end if line_end == -1 else line_end)
+
+
+@functools.lru_cache(maxsize=64)
+def _tz_from_index_name(index_name: str) -> str | None:
+    """Time zone from a UTC offset in the index name, e.g. "Time (UTC+2)" """
+    m = _TZ_RE.search(index_name)
+    return f"Etc/GMT{-int(m.group(1))}" if m else None
+
+
+@functools.lru_cache
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Whether data in `encoding` can be searched and cleaned as bytes
+
+    True for UTF-8 and for single byte encodings which encode ASCII characters as
+    themselves. In these, NUL, line breaks and other ASCII characters never occur as
+    parts of other characters, and there is no BOM.
+    """
+    name = codecs.lookup(encoding).name
+    if name in ("utf-8", "ascii"):
+        return True
+    if "\n".encode(name) != b"\n":  # e.g. a BOM or UTF-16
+        return False
+    decoded = bytes(range(256)).decode(name, errors="replace")
+    return len(decoded) == 256 and decoded[:128] == "".join(map(chr, range(128)))
+
+
+class _Utf8Reader:
+    """Binary stream of a text stream encoded as UTF-8"""
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def read(self, size: int = -1) -> bytes:
+        return self._fp.read(size).encode("utf-8")
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._fp.readline(size).encode("utf-8")
+
+    def close(self):
+        self._fp.close()
+
 
 class _FilepathOrBuffer:
+    """Open a file or a buffer as a binary stream
+
+    Files are read as bytes and decoding is left to pandas, if the encoding allows
+    it. Otherwise, and for text buffers, the data is decoded in Python and encoded
+    as UTF-8. The context manager returns the stream and its encoding.
+    """
+
     def __init__(self, filepath_or_buffer, encoding):
-        if not isinstance(filepath_or_buffer, TextIOBase):
-            if str(filepath_or_buffer).endswith("gz"):  # gzipped file
-                open_func = gzip.open
-            else:  # regular text file
-                open_func = open
-            self._fp = open_func(filepath_or_buffer, mode="rt", encoding=encoding)
-        else:
-            self._fp = filepath_or_buffer
+        if isinstance(filepath_or_buffer, TextIOBase):
+            self._fp = _Utf8Reader(filepath_or_buffer)
+            self._encoding = "utf-8"
+            return
+        # Check the encoding before opening the file, raises LookupError if unknown
+        ascii_compatible = _is_ascii_compatible(encoding)
+        if isinstance(filepath_or_buffer, BufferedIOBase):
+            fp = filepath_or_buffer
+        elif os.fspath(filepath_or_buffer).endswith((".gz", ".gzip")):  # gzipped
+            # Read the decompressed stream in large blocks
+            fp = BufferedReader(
+                _gzip.open(filepath_or_buffer, mode="rb"),
+                buffer_size=_BUFFER_SIZE,
+            )
+        else:  # regular file
+            fp = open(filepath_or_buffer, mode="rb", buffering=_BUFFER_SIZE)
+        if ascii_compatible:
+            self._fp = fp
+            self._encoding = encoding
+        else:  # e.g. UTF-16 or a BOM
+            self._fp = _Utf8Reader(TextIOWrapper(fp, encoding=encoding))
+            self._encoding = "utf-8"
 
     def __enter__(self):
-        return self._fp
+        return self._fp, self._encoding
 
     def __exit__(self, *args):
         self._fp.close()
@@ -45,6 +257,7 @@ class RobustCSVParser:
         column_regex: str | None = None,
         process_func: Callable | None = None,
         default_tz: str = "UTC",
+        chunk_size: int = _CHUNK_SIZE,
         **csv_kwargs,
     ):
         """Robust data parser
@@ -56,7 +269,11 @@ class RobustCSVParser:
             header_regex (optional): Regular expression to detect a header row. Defaults to None.
             column_regex (optional): Regular expression to filter columns with. Defaults to None.
             process_func (optional): Function to call for each DataFrame. Defaults to None.
-            csv_kwargs: Other arguments are passed to `pandas.read_csv`.
+            chunk_size (optional): Number of bytes to read from a file at a time.
+                Larger chunks mean less overhead per chunk but more memory use.
+                Defaults to 4 MiB.
+            csv_kwargs: Other arguments are passed to `pandas.read_csv`. The "c" engine
+                is used unless `engine` is given.
         """
         self.sep = sep
         self.encoding = encoding
@@ -71,6 +288,10 @@ class RobustCSVParser:
         self.column_regex = column_regex or r"."  # by default match anything
         self.process_func = process_func
         self.default_tz = default_tz
+        self.chunk_size = chunk_size
+        self._header_re = {}  # compiled on first parse, by encoding
+        self._column_re = re.compile(self.column_regex)
+        _hook_parser_warnings()
 
     def parse(
         self,
@@ -94,41 +315,61 @@ class RobustCSVParser:
         else:
             worker_logger = logger
         worker_logger.info("Reading file %s", filepath_or_buffer)
-        with _FilepathOrBuffer(filepath_or_buffer, self.encoding) as fp:
-            # Try to guess the header string from first field of first row if not given
+        with (
+            _FilepathOrBuffer(filepath_or_buffer, self.encoding) as (fp, encoding),
+            _log_parser_warnings(str(filepath_or_buffer), worker_logger),
+        ):
+            # Try to guess the header string from first field of first row if not given.
+            # The guess is kept for the following files.
+            first_line = b""
             if self.header_string is None and self.header_regex is None:
-                self.header_string = fp.readline().split(self.sep)[0]
-                fp.seek(0)
-            data = fp.read().replace("\0", "")  # Remove possible NUL values
-
-        frames = []
-        # Create an iterator to find all header rows
-        regex = re.compile(
-            # Allow a quotation mark (" or ') at the start of the header
-            rf"['\"]?({self.header_regex or re.escape(self.header_string)}).*$",
-            flags=re.MULTILINE,
-        )
-        headerrow_finder = re.finditer(regex, data)
-        # Get start index of first header
-        try:
-            start_prev = next(headerrow_finder).start()
-        except StopIteration:
-            worker_logger.error("No header found in %s", filepath_or_buffer)
-            return None
-        # Iterate over all found headers and finally from the last header to end (None)
-        for start in [match.start() for match in headerrow_finder] + [None]:
-            frames.append(
+                first_line = fp.readline(self.chunk_size)
+                line = first_line.decode(encoding, errors="replace")
+                line = _LINE_BREAK_RE.split(line, maxsplit=1)[0]
+                self.header_string = line.split(self.sep)[0]
+            if encoding not in self._header_re:
+                # Search bytes for literal headers, text for other regexes
+                if self.header_regex is None:
+                    header = re.escape(self.header_string).encode(encoding)
+                elif _BYTES_UNSAFE_RE.search(self.header_regex):
+                    header = self.header_regex
+                else:
+                    header = self.header_regex.encode(encoding)
+                self._header_re[encoding] = re.compile(header, flags=re.MULTILINE)
+            # Parse data between header rows as it is read
+            frames = [
                 self._parse_frame(
-                    data[slice(start_prev, start)],  # parse data between indices
-                    str(filepath_or_buffer),
-                    worker_logger,
+                    segment, encoding, str(filepath_or_buffer), worker_logger
                 )
-            )
-            start_prev = start
+                for segment in self._iter_segments(
+                    fp, self._header_re[encoding], first_line, encoding
+                )
+            ]
+        if not frames:
+            worker_logger.error("No header found in %s", filepath_or_buffer)
+            return None
+
+        # Parse timestamps. With a fixed `date_format`, parse them once for each run
+        # of consecutive frames with the same index name, i.e. the same time zone.
+        # Otherwise the format is inferred for each frame separately, as it may
+        # differ between them.
+        if self.csv_kwargs.get("parse_dates", None) is True:
+            frames = [frame for frame in frames if frame is not None]
+            if self.csv_kwargs.get("date_format", None) is not None:
+                frames = [
+                    _concat(group)
+                    for _, group in itertools.groupby(
+                        frames, key=lambda frame: frame.index.name
+                    )
+                ]
+            frames = [
+                self._parse_timestamps(frame, str(filepath_or_buffer), worker_logger)
+                for frame in frames
+            ]
 
         # Join data
         try:
-            df = pd.concat(frames, join="outer")
+            df = _concat(frames)
         except ValueError:
             worker_logger.error("All empty data in %s", filepath_or_buffer)
             return None
@@ -146,95 +387,217 @@ class RobustCSVParser:
     def parse_multifile(
         self,
         filepaths: Iterable[Path | str],
-        n_jobs: int = 1,
+        n_jobs: int | None = 1,
+        backend: str = "threading",
     ) -> pd.DataFrame:
-        """Parse multiple files using multiple processes
+        """Parse multiple files using multiple workers
+
+        Decompression and CSV parsing mostly run in C code which releases the GIL, so
+        threads are usually enough and avoid pickling the resulting frames between
+        processes. Use processes if `process_func` does heavy work in Python.
 
         Args:
             filepaths: An iterable of file paths
-            n_jobs: Number of parallel jobs to spawn
+            n_jobs: Number of parallel jobs to spawn. None uses all CPUs.
+            backend: Either "threading" or "multiprocessing". Defaults to "threading".
         """
-        root_logger = logging.getLogger()
-        mgr = multiprocessing.Manager()
-        log_queue = mgr.Queue()
-        listener = QueueListener(log_queue, *root_logger.handlers)
-        listener.start()
-        logger.info("Starting read using %d workers", n_jobs)
-        try:
-            with multiprocessing.Pool(processes=n_jobs) as pool:
-                frames = pool.map(
-                    functools.partial(
-                        self.parse,
-                        log_queue=log_queue,
-                        log_level=root_logger.getEffectiveLevel(),
-                    ),
-                    filepaths,
-                )
-        finally:
-            logger.info("Done")
-            listener.stop()
+        if backend not in ("threading", "multiprocessing"):
+            raise ValueError(f"Unknown backend: {backend}")
+        filepaths = list(filepaths)
+        # Do not start more workers than there are files
+        n_jobs = n_jobs or os.cpu_count() or 1
+        n_jobs = max(1, min(n_jobs, len(filepaths)))
+        # Send files to the workers in batches to reduce per-task overhead
+        chunksize = max(1, len(filepaths) // (n_jobs * 4))
+        # Read smaller chunks to limit memory use with more workers than CPUs
+        parser = self
+        oversubscription = max(1, n_jobs // (os.cpu_count() or 1))
+        if oversubscription > 1 and self.chunk_size > _MIN_CHUNK_SIZE:
+            parser = copy.copy(self)
+            parser._header_re = dict(self._header_re)  # not shared with `self`
+            parser.chunk_size = max(
+                _MIN_CHUNK_SIZE, self.chunk_size // oversubscription
+            )
+        logger.info("Starting read using %d %s workers", n_jobs, backend)
+        if backend == "threading":
+            # Threads share the logging configuration, no queue needed
+            with ThreadPool(processes=n_jobs) as pool:
+                frames = pool.map(parser.parse, filepaths, chunksize=chunksize)
+        else:
+            # Use one thread for numerical libraries in each worker process to not
+            # oversubscribe the CPUs. Unless already set, the variables are set for
+            # the whole process, so that spawned workers inherit them.
+            for var in _THREAD_ENV_VARS:
+                os.environ.setdefault(var, "1")
+            root_logger = logging.getLogger()
+            mgr = multiprocessing.Manager()
+            log_queue = mgr.Queue()
+            listener = QueueListener(log_queue, *root_logger.handlers)
+            listener.start()
+            try:
+                with multiprocessing.Pool(
+                    processes=n_jobs, initializer=_init_worker
+                ) as pool:
+                    frames = pool.map(
+                        functools.partial(
+                            parser.parse,
+                            log_queue=log_queue,
+                            log_level=root_logger.getEffectiveLevel(),
+                        ),
+                        filepaths,
+                        chunksize=chunksize,
+                    )
+            finally:
+                listener.stop()
+        if parser is not self:  # keep a guessed header, as when parsing with `self`
+            self.header_string = parser.header_string
+            self._header_re = parser._header_re
+        logger.info("Done")
         try:
-            return pd.concat(frames, axis=0, join="outer")
+            return _concat(frames)
         except ValueError:
             logger.error("All empty frames")
             return None
 
-    def _parse_frame(self, data: str, source: str, logger: logging.Logger):
+    def _iter_segments(
+        self, fp, regex: re.Pattern, head: bytes = b"", encoding: str = "utf-8"
+    ):
+        """Read `fp` in chunks and yield the data from each header row to the next
+
+        Only complete lines are searched for headers, the incomplete last line of a
+        chunk is carried over to the next one. Data before the first header is
+        discarded. `head` is data already read from `fp`, which is processed first.
+        Line breaks are converted to newlines and NUL values are removed. `encoding` is
+        the encoding of the data, used for str `regex` patterns.
+        """
+        pieces = []  # data of the current segment read so far
+        in_segment = False
+        tail = b""
+        pending = head  # read but not yet processed
+        while True:
+            raw = fp.read(self.chunk_size)
+            chunk, pending = pending + raw, b""
+            if raw and chunk.endswith(b"\r"):  # may be followed by "\n"
+                chunk, pending = chunk[:-1], b"\r"
+            if b"\r" in chunk:  # Translate line breaks like text mode does
+                chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            if b"\0" in chunk:  # Remove possible NUL values
+                chunk = chunk.translate(None, b"\0")
+            data = tail + chunk
+            end = data.rfind(b"\n") + 1 if raw else len(data)
+            tail = data[end:]
+            view = memoryview(data)  # slice segments without copying
+            segment_start = 0
+            for start in _find_headers(regex, data, end, encoding):
+                if in_segment:
+                    pieces.append(view[segment_start:start])
+                    yield b"".join(pieces)
+                pieces = []
+                in_segment = True
+                segment_start = start
+            if in_segment:
+                pieces.append(view[segment_start:end])
+            if not raw:  # EOF
+                break
+        if in_segment:
+            yield b"".join(pieces)
+
+    def _parse_frame(
+        self, data: bytes, encoding: str, source: str, logger: logging.Logger
+    ):
         csv_kwargs = self.csv_kwargs | dict(
             sep=self.sep,
+            encoding=encoding,
             header=0,
-            engine="c",
+            engine=self.csv_kwargs.get("engine", "c"),
             on_bad_lines="warn",
         )
+        read_dtype = None  # data types applied while reading
+        convert = False  # whether to convert data types after reading
         if "parse_dates" in csv_kwargs:
             csv_kwargs["parse_dates"] = False
             csv_kwargs["dtype"] = None
+            if self.csv_kwargs.get("parse_dates", None) is True:
+                read_dtype = self._read_dtype(csv_kwargs["engine"])
+                csv_kwargs["dtype"] = read_dtype
+                convert = read_dtype is None
 
+        if not _DATA_ROW_RE.search(data):  # only a header row, nothing to parse
+            return None
         try:
-            with warnings.catch_warnings(
-                category=pd.errors.ParserWarning, action="ignore", record=True
-            ) as w:
-                df = (
-                    pd.read_csv(StringIO(data), **csv_kwargs)
-                    .dropna(axis=1, how="all")  # drop empty columns
-                    .filter(regex=self.column_regex)  # filter columns
-                )
-                for message in w:
-                    logger.warning(message)
-
+            try:
+                df = pd.read_csv(BytesIO(data), **csv_kwargs)
+            except ValueError:
+                if read_dtype is None:
+                    raise
+                # E.g. NA values in an integer column, which may be dropped as empty
+                # below. Convert the data types after reading instead.
+                csv_kwargs["dtype"] = None
+                convert = True
+                df = pd.read_csv(BytesIO(data), **csv_kwargs)
         except (pd.errors.ParserError, pd.errors.EmptyDataError, ValueError) as err:
             logger.error("Failed reading file %s: %s", source, err)
             return None
+        if len(df.index) == 0:  # no valid data rows
+            return None
+        # Filter columns and drop empty ones in a single selection
+        matches = [bool(self._column_re.search(str(c))) for c in df.columns]
+        df = df.loc[:, df.notna().any(axis=0).to_numpy() & matches]
 
-        # Parse timestamps
-        if self.csv_kwargs.get("parse_dates", None) is True:
-            # Try to guess the time zone
-            index_name = df.index.name
-            m = re.search(r"UTC(\+\d+)", index_name)
-            if m:
-                tz = f"Etc/GMT{-int(m.group(1))}"
-            else:
-                tz = self.default_tz
-                logger.warning(
-                    "Unable to detect time zone in %s, assuming %s",
-                    source,
-                    tz,
-                )
-            df.index = pd.DatetimeIndex(
-                pd.to_datetime(
-                    df.index,
-                    format=self.csv_kwargs.get("date_format", None),
-                    errors="coerce",
-                ),
-                tz=tz,
-                name=df.index.name,
-            ).tz_convert(self.default_tz)
+        # Convert data, timestamps are parsed after joining the frames. Without
+        # `dtype`, data is converted to float.
+        if convert:
+            dtype = self.csv_kwargs.get("dtype", None)
+            if isinstance(dtype, dict):  # skip dropped columns
+                dtype = {col: t for col, t in dtype.items() if col in df.columns}
             try:
-                with warnings.catch_warnings():
-                    warnings.filterwarnings(message="overflow", action="ignore")
-                    df = df.astype(self.csv_kwargs.get("dtype", None))
+                with np.errstate(over="ignore"):  # thread-local, unlike warnings
+                    df = df.astype(dtype)
             except (ValueError, RuntimeWarning) as err:
                 logger.error("Failed converting data in %s: %s", source, str(err))
                 return None
 
         return df
+
+    def _read_dtype(self, engine: str):
+        """Data types for reading a frame whose timestamps are parsed afterwards
+
+        Returns None if the data types cannot be applied while reading, in which case
+        the data is converted after reading.
+        """
+        dtype = self.csv_kwargs.get("dtype", None)
+        index_col = self.csv_kwargs.get("index_col", None)
+        if dtype is None or isinstance(dtype, dict):
+            return dtype
+        if (
+            engine != "pyarrow"  # does not support defaultdict
+            and isinstance(index_col, (int, str))
+            and not isinstance(index_col, bool)
+        ):
+            # Keep timestamps as they are and use `dtype` for all other columns
+            return defaultdict(lambda: dtype, {index_col: object})
+        return None
+
+    def _parse_timestamps(
+        self, df: pd.DataFrame, source: str, logger: logging.Logger
+    ) -> pd.DataFrame:
+        # Try to guess the time zone
+        index_name = df.index.name
+        tz = _tz_from_index_name(index_name)
+        if tz is None:
+            tz = self.default_tz
+            logger.warning(
+                "Unable to detect time zone in %s, assuming %s",
+                source,
+                tz,
+            )
+        df.index = pd.DatetimeIndex(
+            pd.to_datetime(
+                df.index,
+                format=self.csv_kwargs.get("date_format", None),
+                errors="coerce",
+            ),
+            tz=tz,
+            name=index_name,
+        ).tz_convert(self.default_tz)
+        return df
@@ -0,0 +1,293 @@
+"""Tests for robust_csv_parser"""
+
+import gzip
+import io
+import logging
+import re
+import warnings
+
+import pandas as pd
+import pytest
+
+import robust_csv_parser
+from robust_csv_parser import RobustCSVParser, _find_headers
+
+HEADER = rb"Period start|Read time"
+CHUNK_SIZES = [1, 2, 3, 5, 7, 13, 64, 10**6]
+
+TEXTS = [
+    "Period start,a,b\n1,2,3\n4,5,6\nRead time,a\n7,8\n",
+    "junk\nmore junk\nPeriod start,x\n1,2\nxxPeriod start y\n3\nPeriod",
+    "Period start,a\n1,2\n\n\nPeriod start,a\n\nPeriod start,a\n3,4\n",
+    "x'Period start\n\"'Read time a\n1\n'Read time\"Period start\nPeriod st\n",
+    "Period start,a\r\n1,2\r\nRead time,a\r\n3,4\r\n",
+    "Period start,a\r1,2\rRead time,a\r3,4\r",
+    "Period start,a\n1,\0\02\r\n\0Read time,a\r3\0,4\n",
+    "no header at all\n1,2\n",
+    "",
+]
+
+
+def reference_segments(data: bytes) -> list[bytes]:
+    """Split the whole input at the header rows"""
+    data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n").replace(b"\0", b"")
+    starts = [
+        m.start() for m in re.finditer(rb"['\"]?(" + HEADER + rb").*$", data, re.M)
+    ]
+    return [data[a:b] for a, b in zip(starts, starts[1:] + [None])]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("text", TEXTS)
+def test_iter_segments(text, chunk_size):
+    parser = RobustCSVParser(chunk_size=chunk_size)
+    data = text.encode()
+    segments = list(parser._iter_segments(io.BytesIO(data), re.compile(HEADER)))
+    assert segments == reference_segments(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"Period start,a\n1\n",
+        b'"Period start",a\n1\n"Read time",b\n',
+        b"'Period start',a\n'\"Read time\n",
+        b"x'Period start\n\"'Read time a\n1\n'Read time\"Period start\nPeriod st\n",
+        b"Period start Read time\nRead timeRead time\n",
+        b"a\nPeriod start",
+    ],
+)
+def test_find_headers(data):
+    expected = [
+        m.start() for m in re.finditer(rb"['\"]?(" + HEADER + rb").*$", data, re.M)
+    ]
+    assert list(_find_headers(re.compile(HEADER), data, len(data))) == expected
+
+
+def test_find_headers_end():
+    data = b"Period start\n1\nRead time\n"
+    assert list(_find_headers(re.compile(HEADER), data, 16)) == [0]
+
+
+CSV = (
+    "Period start (UTC+2),avg a,b\n"
+    "2024-01-01 00:00,1,2\n"
+    "2024-01-01 01:00,3,4\n"
+    "Read time (UTC+3),avg a,c\n"
+    "2024-01-01 02:00,5,6\n"
+    "2024-01-01 03:00,7,8\n"
+)
+
+
+def make_parser(**kwargs):
+    return RobustCSVParser(
+        header_regex=r"Period start|Read time",
+        index_col=0,
+        parse_dates=True,
+        date_format="ISO8601",
+        dtype=float,
+        **kwargs,
+    )
+
+
+# Time stamps of CSV in UTC
+INDEX = pd.DatetimeIndex(
+    ["2023-12-31 22:00", "2023-12-31 23:00", "2023-12-31 23:00", "2024-01-01 00:00"],
+    tz="UTC",
+)
+
+
+@pytest.fixture
+def expected():
+    nan = float("nan")
+    return pd.DataFrame(
+        {
+            "avg a": [1.0, 3.0, 5.0, 7.0],
+            "b": [2.0, 4.0, nan, nan],
+            "c": [nan, nan, 6.0, 8.0],
+        },
+        index=INDEX,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("line_break", ["\n", "\r\n", "\r"])
+def test_parse_chunked(expected, chunk_size, line_break):
+    data = CSV.replace("\n", line_break).encode()
+    df = make_parser(chunk_size=chunk_size).parse(io.BytesIO(data))
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10**6])
+def test_parse_nul(expected, chunk_size):
+    data = CSV.replace(",", ",\0").encode()
+    df = make_parser(chunk_size=chunk_size).parse(io.BytesIO(data))
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10**6])
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16", "latin-1"])
+def test_parse_encoding(tmp_path, expected, chunk_size, encoding):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding=encoding, newline="\r\n")
+    parser = make_parser(chunk_size=chunk_size, encoding=encoding)
+    pd.testing.assert_frame_equal(parser.parse(path), expected)
+    with open(path, encoding=encoding) as fp:  # text buffer
+        pd.testing.assert_frame_equal(parser.parse(fp), expected)
+    with open(path, "rb") as fp:
+        pd.testing.assert_frame_equal(parser.parse(fp), expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10**6])
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1", "utf-16"])
+@pytest.mark.parametrize("header_regex", [r"P[äa]iv[äa]", r"\w+ (start|alku)"])
+def test_parse_non_ascii_header(tmp_path, chunk_size, encoding, header_regex):
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "ä\nPäivä alku,x\n1,2\nPäivä alku,x\n3,4\n", encoding=encoding
+    )
+    parser = RobustCSVParser(
+        header_regex=header_regex, encoding=encoding, chunk_size=chunk_size
+    )
+    expected = pd.DataFrame({"Päivä alku": [1, 3], "x": [2, 4]})
+    pd.testing.assert_frame_equal(parser.parse(path).reset_index(drop=True), expected)
+
+
+def test_parse_unknown_encoding(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    opened = []
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: opened.append(args))
+    with pytest.raises(LookupError):
+        make_parser(encoding="no-such-encoding").parse(path)
+    assert not opened
+
+
+def test_parse_multifile_all_cpus(tmp_path, expected):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    df = make_parser().parse_multifile([path, path], n_jobs=None)
+    pd.testing.assert_frame_equal(df, pd.concat([expected, expected]))
+
+
+def test_parser_warnings(tmp_path, caplog, monkeypatch):
+    # pytest replaces the hook while recording warnings
+    monkeypatch.setattr(warnings, "showwarning", robust_csv_parser._show_warning)
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    for path in paths:
+        path.write_text("T,a\n1,2\n3,4,5\nT,a\n1,2\n3,4,5\n")
+    parser = RobustCSVParser(header_string="T")
+    parser.parse_multifile(paths, n_jobs=2)
+    messages = sorted(r.getMessage() for r in caplog.records if "Bad line" in r.message)
+    assert messages == [
+        f"Bad line in {path}: Skipping line 3: expected 2 fields, saw 3"
+        for path in paths
+    ]
+    assert not logging.getLogger("py.warnings").handlers
+
+
+def test_parse_multifile_smaller_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(robust_csv_parser.os, "cpu_count", lambda: 1)
+    path = tmp_path / "data.csv"
+    path.write_text("T,a\n1,2\n")
+    parser = RobustCSVParser()
+    assert len(parser.parse_multifile([path, path], n_jobs=2)) == 2
+    assert parser.chunk_size == robust_csv_parser._CHUNK_SIZE
+    assert parser.header_string == "T"
+    assert len(parser.parse(io.BytesIO(b"x\nT,a\n1,2\n"))) == 1
+
+
+def test_parse_values():
+    df = make_parser(column_regex=r"^avg", default_tz="Europe/Helsinki").parse(
+        io.BytesIO(CSV.encode())
+    )
+    index = INDEX.tz_convert("Europe/Helsinki")
+    expected = pd.DataFrame({"avg a": [1.0, 3.0, 5.0, 7.0]}, index=index)
+    pd.testing.assert_frame_equal(df, expected)
+    assert df.attrs["source"].startswith("<_io.BytesIO")
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".gzip"])
+def test_parse_gzip(tmp_path, expected, suffix):
+    path = tmp_path / f"data.csv{suffix}"
+    with gzip.open(path, "wt", newline="") as fp:
+        fp.write(CSV * 50)
+    df = make_parser(chunk_size=256).parse(path)
+    pd.testing.assert_frame_equal(df, pd.concat([expected] * 50))
+
+
+@pytest.mark.parametrize("backend", ["threading", "multiprocessing"])
+def test_parse_multifile_backends(tmp_path, expected, backend):
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv", tmp_path / "c.csv"]
+    paths[0].write_text(CSV)
+    paths[1].write_text("Period start (UTC+2),avg a,b\n2024-01-02 00:00,9,10\n")
+    paths[2].write_text("no data\n")
+    df = make_parser().parse_multifile(paths, n_jobs=2, backend=backend)
+    second = pd.DataFrame(
+        {"avg a": [9.0], "b": [10.0]},
+        index=pd.DatetimeIndex(["2024-01-01 22:00"], tz="UTC"),
+    )
+    pd.testing.assert_frame_equal(df, pd.concat([expected, second]))
+
+
+def test_parse_multifile_unknown_backend():
+    with pytest.raises(ValueError):
+        make_parser().parse_multifile([], backend="loky")
+
+
+class _Unseekable(io.RawIOBase):
+    """Stream which cannot be rewound, like a pipe"""
+
+    def __init__(self, data: bytes):
+        self._fp = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._fp.readinto(buffer)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10**6])
+@pytest.mark.parametrize("line_break", ["\n", "\r\n", "\r"])
+def test_parse_guess_header(chunk_size, line_break):
+    data = "T,a\n1,2\nT,a\n3,4\n".replace("\n", line_break).encode()
+    parser = RobustCSVParser(chunk_size=chunk_size)
+    df = parser.parse(io.BufferedReader(_Unseekable(data)))
+    expected = pd.DataFrame({"T": [1, 3], "a": [2, 4]})
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), expected)
+    assert parser.header_string == "T"
+    # The guess is kept for the following files
+    df = parser.parse(io.BytesIO(b"junk\nT,a\n5,6\n"))
+    assert df.to_dict("list") == {"T": [5], "a": [6]}
+
+
+@pytest.mark.parametrize("line_break", ["\n", "\r\n", "\r"])
+def test_parse_header_only_segments(caplog, line_break):
+    data = "T,a\nT,a\n  \n\nT,a\n1,2\nT,a".replace("\n", line_break).encode()
+    parser = RobustCSVParser(header_string="T")
+    df = parser.parse(io.BytesIO(data))
+    assert df.to_dict("list") == {"T": [1], "a": [2]}
+    assert not caplog.records
+    # Nothing to parse
+    assert parser.parse(io.BytesIO(b"T,a\nT,a\n")) is None
+    assert [r.getMessage()[:17] for r in caplog.records] == ["All empty data in"]
+
+
+@pytest.mark.parametrize(
+    "dtype, expected_dtype",
+    [(int, "int64"), ({"a": int, "b": int, "c": int}, "int64"), (None, "float64")],
+)
+def test_parse_dtype_empty_column(dtype, expected_dtype):
+    data = b"T (UTC+2),a,b,c\n2024-01-01,1,,2\n2024-01-02,3,,4\n"
+    parser = RobustCSVParser(
+        header_string="T", index_col=0, parse_dates=True, dtype=dtype
+    )
+    df = parser.parse(io.BytesIO(data))
+    expected = pd.DataFrame(
+        {"a": [1, 3], "c": [2, 4]},
+        index=pd.DatetimeIndex(["2023-12-31 22:00", "2024-01-01 22:00"], tz="UTC"),
+        dtype=expected_dtype,
+    )
+    expected.index.name = "T (UTC+2)"
+    pd.testing.assert_frame_equal(df, expected)